@@ -0,0 +1,11 @@
+from django.core.cache import cache
+
+
+def summary_cache_key(user_id):
+    """Cache key for a user's analytics summary"""
+    return f'analytics:summary:{user_id}'
+
+
+def invalidate_user_analytics(user_id):
+    """Drop cached analytics for a user after their files change"""
+    cache.delete(summary_cache_key(user_id))
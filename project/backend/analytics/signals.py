@@ -0,0 +1,16 @@
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from files.models import FileAsset
+from .cache import invalidate_user_analytics
+
+
+@receiver(post_save, sender=FileAsset)
+@receiver(post_delete, sender=FileAsset)
+def invalidate_analytics_on_file_change(sender, instance, **kwargs):
+    """Keep cached analytics in sync with the user's files"""
+    # Wait for the surrounding transaction so a concurrent request
+    # cannot re-cache the pre-commit state
+    user_id = instance.user_id
+    transaction.on_commit(lambda: invalidate_user_analytics(user_id))
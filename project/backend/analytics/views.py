@@ -1,17 +1,17 @@
 from rest_framework import viewsets, permissions
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from django.db.models import Sum, Count, Avg, Q
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Sum, Count, Avg, Q, Value
+from django.db.models.functions import Coalesce, TruncDate
 from django.utils import timezone
 from datetime import timedelta, date
 import structlog
 
+from ecolink.log import bind_request
 from files.models import FileAsset
-from .serializers import (
-    AnalyticsSummarySerializer, 
-    FileTypeAnalyticsSerializer,
-    ImpactTrendSerializer
-)
+from .cache import summary_cache_key
 
 logger = structlog.get_logger(__name__)
 
@@ -25,94 +25,86 @@ class AnalyticsViewSet(viewsets.GenericViewSet):
     def get_summary(self, request):
         """Get comprehensive analytics summary for the user"""
         try:
-            user_files = FileAsset.objects.filter(user=request.user)
-            
-            # Basic metrics
-            total_files = user_files.count()
-            
-            if total_files == 0:
-                return Response({
-                    'total_files': 0,
-                    'total_size_bytes': 0,
-                    'total_size_gb': 0.0,
-                    'total_co2_saved_g': 0.0,
-                    'total_kwh_saved': 0.0,
-                    'duplicates_count': 0,
-                    'duplicates_percentage': 0.0,
-                    'average_impact_score': 0.0,
-                    'files_this_month': 0,
-                    'co2_saved_this_month': 0.0
-                })
-            
-            # Aggregate data
-            aggregates = user_files.aggregate(
-                total_size=Sum('size_bytes'),
-                total_co2=Sum('co2_g_estimate'),
-                total_kwh=Sum('kwh_estimate'),
-                avg_impact=Avg('impact_score')
+            summary_data = cache.get_or_set(
+                summary_cache_key(request.user.id),
+                lambda: self._compute_summary(request.user),
+                timeout=settings.ANALYTICS_CACHE_TIMEOUT
             )
             
-            # Calculate duplicates
-            duplicates_count = user_files.filter(duplicate_of__isnull=False).count()
-            duplicates_percentage = (duplicates_count / total_files) * 100 if total_files > 0 else 0
-            
-            # CO2 saved from duplicates (estimated)
-            duplicate_files = user_files.filter(duplicate_of__isnull=False)
-            total_co2_saved_g = duplicate_files.aggregate(saved=Sum('co2_g_estimate'))['saved'] or 0
-            total_kwh_saved = duplicate_files.aggregate(saved=Sum('kwh_estimate'))['saved'] or 0
-            
-            # This month's data
-            first_day_this_month = timezone.now().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-            this_month_files = user_files.filter(created_at__gte=first_day_this_month)
-            files_this_month = this_month_files.count()
-            co2_saved_this_month = this_month_files.filter(
-                duplicate_of__isnull=False
-            ).aggregate(saved=Sum('co2_g_estimate'))['saved'] or 0
+            return Response(summary_data)
             
-            summary_data = {
-                'total_files': total_files,
-                'total_size_bytes': aggregates['total_size'] or 0,
-                'total_size_gb': round((aggregates['total_size'] or 0) / (1024**3), 2),
-                'total_co2_saved_g': round(total_co2_saved_g, 2),
-                'total_kwh_saved': round(total_kwh_saved, 4),
-                'duplicates_count': duplicates_count,
-                'duplicates_percentage': round(duplicates_percentage, 1),
-                'average_impact_score': round(aggregates['avg_impact'] or 0, 1),
-                'files_this_month': files_this_month,
-                'co2_saved_this_month': round(co2_saved_this_month, 2)
-            }
-            
-            serializer = AnalyticsSummarySerializer(summary_data)
-            return Response(serializer.data)
-            
-        except Exception as e:
-            logger.error(f"Error getting analytics summary: {e}")
+        except Exception:
+            bind_request(logger, request).error("analytics.summary_failed", exc_info=True)
             return Response({'error': 'Failed to fetch analytics summary'}, status=500)
     
+    def _compute_summary(self, user):
+        """Aggregate the summary metrics for a user's files"""
+        user_files = FileAsset.objects.filter(user=user)
+        first_day_this_month = timezone.now().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+        duplicates = Q(is_duplicate=True)
+        
+        # Compute every metric in a single pass over the user's files
+        aggregates = user_files.aggregate(
+            total_files=Count('id'),
+            total_size=Sum('size_bytes'),
+            avg_impact=Avg('impact_score'),
+            duplicates_count=Count('id', filter=duplicates),
+            co2_saved=Sum('co2_g_estimate', filter=duplicates),
+            kwh_saved=Sum('kwh_estimate', filter=duplicates),
+            files_this_month=Count('id', filter=Q(created_at__gte=first_day_this_month)),
+            co2_saved_this_month=Sum(
+                'co2_g_estimate',
+                filter=duplicates & Q(created_at__gte=first_day_this_month)
+            ),
+        )
+        
+        total_files = aggregates['total_files']
+        total_size = aggregates['total_size'] or 0
+        duplicates_count = aggregates['duplicates_count']
+        duplicates_percentage = (duplicates_count / total_files) * 100 if total_files > 0 else 0.0
+        
+        summary_data = {
+            'total_files': total_files,
+            'total_size_bytes': total_size,
+            'total_size_gb': round(total_size / (1024**3), 2),
+            'total_co2_saved_g': round(aggregates['co2_saved'] or 0.0, 2),
+            'total_kwh_saved': round(aggregates['kwh_saved'] or 0.0, 4),
+            'duplicates_count': duplicates_count,
+            'duplicates_percentage': round(duplicates_percentage, 1),
+            'average_impact_score': round(aggregates['avg_impact'] or 0.0, 1),
+            'files_this_month': aggregates['files_this_month'],
+            'co2_saved_this_month': round(aggregates['co2_saved_this_month'] or 0.0, 2)
+        }
+        
+        return summary_data
+    
     @action(detail=False, methods=['get'], url_path='file-types')
     def get_file_types(self, request):
         """Get analytics breakdown by file type"""
         try:
             user_files = FileAsset.objects.filter(user=request.user)
             
-            # Group by MIME type
-            file_type_data = user_files.values('mime_type').annotate(
+            # Group by MIME type, labelling files without one in the database
+            file_type_data = user_files.values(
+                file_type=Coalesce('mime_type', Value('Unknown'))
+            ).annotate(
                 count=Count('id'),
                 total_size_bytes=Sum('size_bytes'),
                 average_impact_score=Avg('impact_score')
             ).order_by('-total_size_bytes')
             
-            # Clean up None mime_types
-            for item in file_type_data:
-                if item['mime_type'] is None:
-                    item['mime_type'] = 'Unknown'
-                item['average_impact_score'] = round(item['average_impact_score'] or 0, 1)
-            
-            serializer = FileTypeAnalyticsSerializer(file_type_data, many=True)
-            return Response(serializer.data)
-            
-        except Exception as e:
-            logger.error(f"Error getting file type analytics: {e}")
+            return Response([
+                {
+                    'mime_type': row['file_type'],
+                    'count': row['count'],
+                    'total_size_bytes': row['total_size_bytes'],
+                    'average_impact_score': round(row['average_impact_score'], 1)
+                }
+                for row in file_type_data
+            ])
+            
+        except Exception:
+            bind_request(logger, request).error("analytics.file_types_failed", exc_info=True)
             return Response({'error': 'Failed to fetch file type analytics'}, status=500)
     
     @action(detail=False, methods=['get'], url_path='impact-trend')
@@ -127,31 +119,36 @@ class AnalyticsViewSet(viewsets.GenericViewSet):
                 created_at__date__gte=start_date
             )
             
-            # Group by date
+            # Aggregate per day in the database, then fill in days without uploads
+            daily_rows = user_files.annotate(
+                day=TruncDate('created_at')
+            ).values('day').annotate(
+                files_count=Count('id'),
+                total_co2=Sum('co2_g_estimate'),
+                total_kwh=Sum('kwh_estimate'),
+                duplicates_count=Count('id', filter=Q(is_duplicate=True))
+            ).order_by('day')
+            by_date = {row['day']: row for row in daily_rows.iterator(chunk_size=500)}
+            
             trend_data = []
             current_date = start_date
             end_date = timezone.now().date()
             
             while current_date <= end_date:
-                day_files = user_files.filter(created_at__date=current_date)
-                day_aggregates = day_files.aggregate(
-                    total_co2=Sum('co2_g_estimate'),
-                    total_kwh=Sum('kwh_estimate')
-                )
+                day_row = by_date.get(current_date, {})
                 
                 trend_data.append({
                     'date': current_date,
-                    'files_count': day_files.count(),
-                    'total_co2_g': round(day_aggregates['total_co2'] or 0, 2),
-                    'total_kwh': round(day_aggregates['total_kwh'] or 0, 4),
-                    'duplicates_count': day_files.filter(duplicate_of__isnull=False).count()
+                    'files_count': day_row.get('files_count', 0),
+                    'total_co2_g': round(day_row.get('total_co2') or 0.0, 2),
+                    'total_kwh': round(day_row.get('total_kwh') or 0.0, 4),
+                    'duplicates_count': day_row.get('duplicates_count', 0)
                 })
                 
                 current_date += timedelta(days=1)
             
-            serializer = ImpactTrendSerializer(trend_data, many=True)
-            return Response(serializer.data)
+            return Response(trend_data)
             
-        except Exception as e:
-            logger.error(f"Error getting impact trend: {e}")
+        except Exception:
+            bind_request(logger, request).error("analytics.impact_trend_failed", exc_info=True)
             return Response({'error': 'Failed to fetch impact trend'}, status=500)
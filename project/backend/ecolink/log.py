@@ -0,0 +1,6 @@
+def bind_request(logger, request):
+    """Bind the requesting user and request id to a structlog logger"""
+    return logger.bind(
+        user_id=request.user.id,
+        request_id=request.META.get('HTTP_X_REQUEST_ID')
+    )
@@ -0,0 +1,27 @@
+import orjson
+from rest_framework.renderers import BaseRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+
+class ORJSONRenderer(BaseRenderer):
+    """JSON renderer backed by orjson, a drop-in for DRF's JSONRenderer"""
+    
+    media_type = 'application/json'
+    format = 'json'
+    charset = None
+    
+    # Types orjson does not handle natively (Decimal, lazy strings,
+    # querysets, ...) are delegated to DRF's own encoder
+    _fallback_encoder = JSONEncoder()
+    
+    # Dates and times go through DRF's encoder too, so they keep its
+    # millisecond precision and "Z" suffix. Non-string keys appear in
+    # DRF's validation errors for list and dict fields.
+    _options = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+    
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return orjson.dumps(
+            data, default=self._fallback_encoder.default, option=self._options
+        )
@@ -92,11 +92,20 @@ WSGI_APPLICATION = 'ecolink.wsgi.application'
 # https://docs.djangoproject.com/en/5.1/ref/settings/#databases
 
 # Use PostgreSQL in production (Railway) or MySQL locally
+# Keep connections open between requests instead of reconnecting each time
+# (WSGI and Celery only; set DB_CONN_MAX_AGE=0 when serving ecolink.asgi, where
+# every request runs in its own thread and persistent connections leak)
+DB_CONN_MAX_AGE = int(os.environ.get('DB_CONN_MAX_AGE', 60))  # seconds
+
 if os.environ.get('DATABASE_URL'):
     # Production - PostgreSQL
     import dj_database_url
     DATABASES = {
-        'default': dj_database_url.parse(os.environ.get('DATABASE_URL'))
+        'default': dj_database_url.parse(
+            os.environ.get('DATABASE_URL'),
+            conn_max_age=DB_CONN_MAX_AGE,
+            conn_health_checks=True,
+        )
     }
 else:
     # Development - MySQL
@@ -108,6 +117,8 @@ else:
             'PASSWORD': os.environ.get('MYSQL_PASSWORD', 'password'),
             'HOST': os.environ.get('MYSQL_HOST', 'localhost'),
             'PORT': os.environ.get('MYSQL_PORT', '3306'),
+            'CONN_MAX_AGE': DB_CONN_MAX_AGE,
+            'CONN_HEALTH_CHECKS': True,
             'OPTIONS': {
                 'init_command': "SET sql_mode='STRICT_TRANS_TABLES'",
                 'charset': 'utf8mb4',
@@ -181,7 +192,7 @@ REST_FRAMEWORK = {
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 20,
     'DEFAULT_RENDERER_CLASSES': [
-        'rest_framework.renderers.JSONRenderer',
+        'ecolink.renderers.ORJSONRenderer',
     ],
 }
 
@@ -211,6 +222,21 @@ CELERY_TASK_SERIALIZER = 'json'
 CELERY_RESULT_SERIALIZER = 'json'
 CELERY_TIMEZONE = TIME_ZONE
 
+# Cache Configuration
+CACHES = {
+    'default': {
+        'BACKEND': 'django_redis.cache.RedisCache',
+        'LOCATION': os.environ.get('REDIS_CACHE_URL', 'redis://localhost:6379/1'),
+        'OPTIONS': {
+            'CLIENT_CLASS': 'django_redis.client.DefaultClient',
+            # Treat a Redis outage as a cache miss instead of failing the request
+            'IGNORE_EXCEPTIONS': True,
+        },
+    }
+}
+DJANGO_REDIS_LOG_IGNORED_EXCEPTIONS = True
+ANALYTICS_CACHE_TIMEOUT = int(os.environ.get('ANALYTICS_CACHE_TIMEOUT', 300))  # seconds
+
 # S3/MinIO Configuration
 AWS_ACCESS_KEY_ID = os.environ.get('S3_KEY', 'minioadmin')
 AWS_SECRET_ACCESS_KEY = os.environ.get('S3_SECRET', 'minioadmin')
@@ -219,6 +245,10 @@ AWS_S3_ENDPOINT_URL = os.environ.get('S3_ENDPOINT', 'http://localhost:9000')
 AWS_S3_REGION_NAME = os.environ.get('AWS_S3_REGION_NAME', 'us-east-1')
 AWS_S3_USE_SSL = os.environ.get('S3_USE_SSL', 'False').lower() == 'true'
 AWS_S3_SIGNATURE_VERSION = 's3v4'
+# Public CDN domain for the bucket; downloads skip signing when query-string auth is off
+AWS_S3_CUSTOM_DOMAIN = os.environ.get('S3_CUSTOM_DOMAIN') or None
+AWS_QUERYSTRING_AUTH = os.environ.get('S3_QUERYSTRING_AUTH', 'True').lower() == 'true'
+AWS_S3_MAX_POOL_CONNECTIONS = int(os.environ.get('S3_MAX_POOL_CONNECTIONS', 50))
 
 # File Upload Configuration
 FILE_UPLOAD_MAX_MEMORY_SIZE = 100 * 1024 * 1024  # 100MB
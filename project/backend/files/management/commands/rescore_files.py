@@ -0,0 +1,54 @@
+from django.core.management.base import BaseCommand
+
+from analytics.cache import invalidate_user_analytics
+from files.models import FileAsset
+from files.tasks import calculate_impact
+
+
+class Command(BaseCommand):
+    """Recompute impact estimates for every file, e.g. after tuning REGION_* settings"""
+    
+    help = 'Recompute kWh, CO2 and impact score estimates for all files'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Number of rows fetched and updated per query'
+        )
+    
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        rows = FileAsset.objects.values_list('id', 'user_id', 'size_bytes').iterator(chunk_size=batch_size)
+        
+        batch = []
+        updated = 0
+        user_ids = set()
+        for file_id, user_id, size_bytes in rows:
+            user_ids.add(user_id)
+            kwh_estimate, co2_g_estimate, impact_score = calculate_impact(size_bytes)
+            batch.append(FileAsset(
+                id=file_id,
+                kwh_estimate=kwh_estimate,
+                co2_g_estimate=co2_g_estimate,
+                impact_score=impact_score
+            ))
+            
+            if len(batch) >= batch_size:
+                updated += self._flush(batch)
+                batch = []
+        
+        if batch:
+            updated += self._flush(batch)
+        
+        # bulk_update sends no post_save, so drop cached summaries explicitly
+        for user_id in user_ids:
+            invalidate_user_analytics(user_id)
+        
+        self.stdout.write(self.style.SUCCESS(f'Rescored {updated} files'))
+    
+    def _flush(self, batch):
+        return FileAsset.objects.bulk_update(
+            batch, ['kwh_estimate', 'co2_g_estimate', 'impact_score']
+        )
@@ -0,0 +1,24 @@
+# Generated by Django 5.1.1 on 2026-10-15 10:04
+
+from django.db import migrations, models
+
+
+def backfill_is_duplicate(apps, schema_editor):
+    FileAsset = apps.get_model("files", "FileAsset")
+    FileAsset.objects.filter(duplicate_of__isnull=False).update(is_duplicate=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("files", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="fileasset",
+            name="is_duplicate",
+            field=models.BooleanField(default=False),
+        ),
+        migrations.RunPython(backfill_is_duplicate, migrations.RunPython.noop),
+    ]
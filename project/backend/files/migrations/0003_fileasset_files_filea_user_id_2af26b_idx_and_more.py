@@ -0,0 +1,57 @@
+# Generated by Django 5.1.1 on 2026-10-15 10:04
+
+from django.db import migrations, models
+
+
+class AddIndexConcurrently(migrations.AddIndex):
+    """
+    AddIndex that builds the index without blocking writes on PostgreSQL.
+    
+    django.contrib.postgres's operation of the same name cannot be imported
+    without psycopg, so on the MySQL development database this falls back
+    to a plain CREATE INDEX.
+    """
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        model = to_state.apps.get_model(app_label, self.model_name)
+        if self.allow_migrate_model(schema_editor.connection.alias, model):
+            schema_editor.add_index(model, self.index, **self._concurrently(schema_editor))
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        model = from_state.apps.get_model(app_label, self.model_name)
+        if self.allow_migrate_model(schema_editor.connection.alias, model):
+            schema_editor.remove_index(model, self.index, **self._concurrently(schema_editor))
+
+    @staticmethod
+    def _concurrently(schema_editor):
+        if schema_editor.connection.vendor == "postgresql":
+            return {"concurrently": True}
+        return {}
+
+
+class Migration(migrations.Migration):
+
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ("files", "0002_fileasset_is_duplicate"),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="fileasset",
+            index=models.Index(
+                fields=["user", "created_at", "is_duplicate"],
+                name="files_filea_user_id_2af26b_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="fileasset",
+            index=models.Index(
+                condition=models.Q(("is_duplicate", True)),
+                fields=["user", "created_at"],
+                name="files_user_dup_partial",
+            ),
+        ),
+    ]
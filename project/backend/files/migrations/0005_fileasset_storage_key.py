@@ -0,0 +1,51 @@
+# Generated by Django 5.1.1 on 2026-10-15 12:02
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def key_from_storage_url(storage_url):
+    # storage_url is "<endpoint>/<bucket>/<key>" built from the raw key, so
+    # "#" and "?" from filenames are literal; strip the prefix as plain text
+    endpoint = (settings.AWS_S3_ENDPOINT_URL or "").rstrip("/")
+    if endpoint and storage_url.startswith(endpoint + "/"):
+        path = storage_url[len(endpoint):]
+    else:
+        scheme, sep, rest = storage_url.partition("://")
+        if not sep or scheme not in ("http", "https"):
+            return None
+        path = rest.partition("/")[2]
+
+    # An endpoint configured with a trailing slash leaves "//" before the bucket
+    key = path.lstrip("/").partition("/")[2].lstrip("/")
+    return key if key.startswith("uploads/") else None
+
+
+def backfill_storage_key(apps, schema_editor):
+    FileAsset = apps.get_model("files", "FileAsset")
+    files = FileAsset.objects.filter(storage_url__isnull=False).only("id", "storage_url")
+
+    batch = []
+    for file_asset in files.iterator(chunk_size=1000):
+        key = key_from_storage_url(file_asset.storage_url)
+        if key:
+            file_asset.storage_key = key
+            batch.append(file_asset)
+
+    FileAsset.objects.bulk_update(batch, ["storage_key"], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("files", "0003_fileasset_files_filea_user_id_2af26b_idx_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="fileasset",
+            name="storage_key",
+            field=models.CharField(blank=True, max_length=500, null=True),
+        ),
+        migrations.RunPython(backfill_storage_key, migrations.RunPython.noop),
+    ]
@@ -12,6 +12,7 @@ class FileAsset(models.Model):
     mime_type = models.CharField(max_length=255, blank=True, null=True)
     sha256 = models.CharField(max_length=64, db_index=True)  # SHA-256 hash for duplicate detection
     storage_url = models.URLField(max_length=500, blank=True, null=True)  # S3 URL
+    storage_key = models.CharField(max_length=500, blank=True, null=True)  # S3 object key
     duplicate_of = models.ForeignKey(
         'self', 
         on_delete=models.SET_NULL, 
@@ -19,6 +20,7 @@ class FileAsset(models.Model):
         blank=True,
         related_name='duplicates'
     )
+    is_duplicate = models.BooleanField(default=False)  # Denormalized duplicate_of IS NOT NULL; see files.signals
     
     # Environmental impact estimates
     kwh_estimate = models.FloatField(
@@ -43,16 +45,18 @@ class FileAsset(models.Model):
             models.Index(fields=['sha256']),
             models.Index(fields=['user', '-created_at']),
             models.Index(fields=['created_at']),
+            # Analytics filters on user plus date and/or duplicate status
+            models.Index(fields=['user', 'created_at', 'is_duplicate']),
+            models.Index(
+                fields=['user', 'created_at'],
+                name='files_user_dup_partial',
+                condition=models.Q(is_duplicate=True),
+            ),
         ]
     
     def __str__(self):
         return f"{self.filename} ({self.user.username})"
     
-    @property
-    def is_duplicate(self):
-        """Check if this file is a duplicate of another"""
-        return self.duplicate_of is not None
-    
     @property
     def size_mb(self):
         """Return file size in MB"""
@@ -29,7 +29,6 @@ class FileAssetSerializer(serializers.ModelSerializer):
     user = UserSerializer(read_only=True)
     duplicate_of = serializers.SerializerMethodField()
     recommendations = RecommendationSerializer(many=True, read_only=True)
-    is_duplicate = serializers.ReadOnlyField()
     size_mb = serializers.ReadOnlyField()
     size_gb = serializers.ReadOnlyField()
     
@@ -42,7 +41,7 @@ class FileAssetSerializer(serializers.ModelSerializer):
             'recommendations', 'created_at', 'updated_at'
         ]
         read_only_fields = [
-            'id', 'user', 'sha256', 'storage_url', 'duplicate_of',
+            'id', 'user', 'sha256', 'storage_url', 'duplicate_of', 'is_duplicate',
             'kwh_estimate', 'co2_g_estimate', 'impact_score',
             'created_at', 'updated_at'
         ]
@@ -54,29 +53,29 @@ class FileAssetSerializer(serializers.ModelSerializer):
                 'id': obj.duplicate_of.id,
                 'filename': obj.duplicate_of.filename,
                 'user': obj.duplicate_of.user.username,
-                'created_at': obj.duplicate_of.created_at
+                'created_at': serializers.DateTimeField().to_representation(
+                    obj.duplicate_of.created_at
+                )
             }
         return None
 
 
-class FileAssetListSerializer(serializers.ModelSerializer):
-    """Simplified serializer for file listing"""
+class FileAssetListSerializer(serializers.Serializer):
+    """Simplified serializer for file listing, fed with values() rows"""
     
-    user = serializers.CharField(source='user.username', read_only=True)
-    is_duplicate = serializers.ReadOnlyField()
-    size_mb = serializers.ReadOnlyField()
-    recommendations_count = serializers.SerializerMethodField()
+    id = serializers.IntegerField(read_only=True)
+    user = serializers.CharField(source='username', read_only=True)
+    filename = serializers.CharField(read_only=True)
+    size_bytes = serializers.IntegerField(read_only=True)
+    size_mb = serializers.SerializerMethodField()
+    mime_type = serializers.CharField(read_only=True)
+    is_duplicate = serializers.BooleanField(read_only=True)
+    impact_score = serializers.IntegerField(read_only=True)
+    recommendations_count = serializers.IntegerField(read_only=True)
+    created_at = serializers.DateTimeField(read_only=True)
     
-    class Meta:
-        model = FileAsset
-        fields = [
-            'id', 'user', 'filename', 'size_bytes', 'size_mb',
-            'mime_type', 'is_duplicate', 'impact_score',
-            'recommendations_count', 'created_at'
-        ]
-    
-    def get_recommendations_count(self, obj):
-        return obj.recommendations.count()
+    def get_size_mb(self, obj):
+        return obj['size_bytes'] / (1024 * 1024)
 
 
 class FileCommitSerializer(serializers.Serializer):
@@ -93,4 +92,18 @@ class FileCommitSerializer(serializers.Serializer):
         max_size = getattr(settings, 'MAX_UPLOAD_SIZE', 500 * 1024 * 1024)
         if value > max_size:
             raise serializers.ValidationError(f'File size exceeds maximum allowed size of {max_size} bytes')
+        return value
+    
+    def validate_bucket(self, value):
+        """Only accept uploads to the configured bucket"""
+        from django.conf import settings
+        if value != settings.AWS_STORAGE_BUCKET_NAME:
+            raise serializers.ValidationError('Unknown bucket')
+        return value
+    
+    def validate_key(self, value):
+        """Only accept keys issued to the requesting user by request-upload-url"""
+        prefix = f"uploads/{self.context['request'].user.id}/"
+        if not value.startswith(prefix) or len(value) == len(prefix):
+            raise serializers.ValidationError('Key does not belong to this user')
         return value
\ No newline at end of file
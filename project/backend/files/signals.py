@@ -0,0 +1,34 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, pre_delete
+from django.dispatch import receiver
+
+from analytics.cache import invalidate_user_analytics
+from .models import FileAsset
+from .storage import invalidate_presigned_url
+
+
+@receiver(pre_delete, sender=FileAsset)
+def clear_duplicate_flags_on_delete(sender, instance, **kwargs):
+    """Un-flag duplicates of a file before SET_NULL detaches them"""
+    # SET_NULL clears duplicate_of with a plain UPDATE, so is_duplicate
+    # has to be reset here to stay in step with it
+    duplicates = FileAsset.objects.filter(duplicate_of=instance, is_duplicate=True)
+    user_ids = set(duplicates.values_list('user_id', flat=True))
+    if not user_ids:
+        return
+    duplicates.update(is_duplicate=False)
+
+    def invalidate():
+        for user_id in user_ids:
+            invalidate_user_analytics(user_id)
+
+    transaction.on_commit(invalidate)
+
+
+@receiver(post_delete, sender=FileAsset)
+def invalidate_presigned_url_on_delete(sender, instance, **kwargs):
+    """Stop handing out download URLs for deleted files"""
+    if not instance.storage_key:
+        return
+    user_id, key = instance.user_id, instance.storage_key
+    transaction.on_commit(lambda: invalidate_presigned_url(user_id, key))
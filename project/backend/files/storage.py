@@ -0,0 +1,102 @@
+import threading
+import time
+from urllib.parse import quote
+
+from boto3 import client
+from botocore.config import Config
+from django.conf import settings
+from django.core.cache import cache
+
+PRESIGNED_URL_EXPIRES_IN = 3600  # 1 hour
+PRESIGNED_URL_REFRESH_MARGIN = 300  # Re-sign cached URLs this close to expiry
+
+# Resolved once at import rather than through LazySettings on every request
+S3_BUCKET = settings.AWS_STORAGE_BUCKET_NAME
+S3_PUBLIC_BASE_URL = (
+    f"https://{settings.AWS_S3_CUSTOM_DOMAIN}"
+    if settings.AWS_S3_CUSTOM_DOMAIN and not settings.AWS_QUERYSTRING_AUTH else None
+)
+_S3_CLIENT_KWARGS = {
+    'endpoint_url': settings.AWS_S3_ENDPOINT_URL,
+    'aws_access_key_id': settings.AWS_ACCESS_KEY_ID,
+    'aws_secret_access_key': settings.AWS_SECRET_ACCESS_KEY,
+    'region_name': settings.AWS_S3_REGION_NAME,
+    'use_ssl': settings.AWS_S3_USE_SSL,
+    'config': Config(
+        signature_version=settings.AWS_S3_SIGNATURE_VERSION,
+        # Size the HTTP pool for every thread sharing the client
+        max_pool_connections=settings.AWS_S3_MAX_POOL_CONNECTIONS,
+        retries={'max_attempts': 3, 'mode': 'adaptive'},
+        tcp_keepalive=True,
+    ),
+}
+
+_s3_client = None
+_s3_client_lock = threading.Lock()
+
+
+def get_s3_client():
+    """
+    Return the process-wide S3 client, creating it on first use.
+    
+    botocore clients are thread-safe, and building one is expensive
+    (service model loading, endpoint resolution, a new HTTP pool), so a
+    single instance is shared by every request handled in the process.
+    """
+    global _s3_client
+    if _s3_client is None:
+        with _s3_client_lock:
+            if _s3_client is None:
+                _s3_client = client('s3', **_S3_CLIENT_KWARGS)
+    return _s3_client
+
+
+def get_public_url(key):
+    """Return the unsigned CDN URL for a key, or None when downloads must be signed"""
+    if not S3_PUBLIC_BASE_URL:
+        return None
+    return f"{S3_PUBLIC_BASE_URL}/{quote(key)}"
+
+
+def presigned_url_cache_key(user_id, key, method='get_object'):
+    """Cache key for a user's presigned URL to a storage key"""
+    return f'presign:{user_id}:{method}:{key}'
+
+
+def get_presigned_download_url(file_asset, bucket, key):
+    """
+    Return a presigned GET URL for a file and its remaining lifetime.
+    
+    The URL is kept in the shared cache so every worker and host reuses
+    it until it gets within PRESIGNED_URL_REFRESH_MARGIN seconds of
+    expiring. If the cache is unavailable the URL is simply re-signed.
+    
+    Returns:
+        Tuple of (url, expires_in_seconds)
+    """
+    cache_key = presigned_url_cache_key(file_asset.user_id, key)
+    cached = cache.get(cache_key)
+    if cached:
+        url, expires_at = cached
+        return url, max(int(expires_at - time.time()), 0)
+    
+    url = get_s3_client().generate_presigned_url(
+        'get_object',
+        Params={'Bucket': bucket, 'Key': key},
+        ExpiresIn=PRESIGNED_URL_EXPIRES_IN,
+        HttpMethod='GET'
+    )
+    
+    # Wall-clock expiry so other hosts can report the remaining lifetime
+    cache.set(
+        cache_key,
+        (url, time.time() + PRESIGNED_URL_EXPIRES_IN),
+        timeout=PRESIGNED_URL_EXPIRES_IN - PRESIGNED_URL_REFRESH_MARGIN
+    )
+    
+    return url, PRESIGNED_URL_EXPIRES_IN
+
+
+def invalidate_presigned_url(user_id, key):
+    """Drop a cached presigned URL once its file is gone"""
+    cache.delete(presigned_url_cache_key(user_id, key))
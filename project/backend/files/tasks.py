@@ -1,17 +1,69 @@
 import hashlib
 import magic
 import structlog
-from io import BytesIO
 from celery import shared_task
 from django.contrib.auth.models import User
 from django.conf import settings
-from boto3 import client
+from django.db import transaction
+from boto3.s3.transfer import TransferConfig, create_transfer_manager
 from botocore.exceptions import ClientError
+from s3transfer.subscribers import BaseSubscriber
 
 from .models import FileAsset, Recommendation
+from .storage import get_s3_client
 
 logger = structlog.get_logger(__name__)
 
+# Number of leading bytes kept for MIME type detection; libmagic's
+# signatures for common formats all fall within the first 8KB
+MIME_SNIFF_BYTES = 8192
+
+# Content types that carry no information: the browser's fallback and
+# the type S3 itself assigns when an upload specifies none
+GENERIC_CONTENT_TYPES = frozenset({'', 'application/octet-stream', 'binary/octet-stream'})
+
+# Top-level MIME types that can be shared as a streaming link
+STREAMABLE_MEDIA_TYPES = frozenset({'video', 'audio'})
+
+# Fetch large objects as concurrent ranged GETs; the sink still receives
+# the parts in order, so memory stays bounded by concurrency * chunksize
+S3_TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=8 * 1024 * 1024,
+    multipart_chunksize=8 * 1024 * 1024,
+    max_concurrency=8,
+    use_threads=True,
+)
+
+
+class _HashingSink:
+    """Write-only file object that hashes downloaded chunks as they arrive"""
+    
+    def __init__(self, sniff_bytes=MIME_SNIFF_BYTES):
+        self.sha256 = hashlib.sha256()
+        self.head = bytearray()
+        self.sniff_bytes = sniff_bytes
+    
+    def write(self, data):
+        self.sha256.update(data)
+        if len(self.head) < self.sniff_bytes:
+            self.head.extend(data[:self.sniff_bytes - len(self.head)])
+        return len(data)
+
+
+class _KnownObjectSubscriber(BaseSubscriber):
+    """Hand the transfer metadata we already have so it skips its own HeadObject"""
+    
+    def __init__(self, size, etag):
+        self.size = size
+        self.etag = etag
+    
+    def on_queued(self, future, **kwargs):
+        future.meta.provide_transfer_size(self.size)
+        # Newer s3transfer pins ranged GETs to the ETag and heads the
+        # object itself unless it is provided as well
+        if hasattr(future.meta, 'provide_object_etag'):
+            future.meta.provide_object_etag(self.etag)
+
 
 @shared_task
 def analyze_file(user_id, bucket, key, filename, size_bytes):
@@ -25,74 +77,83 @@ def analyze_file(user_id, bucket, key, filename, size_bytes):
         filename: Original filename
         size_bytes: File size in bytes
     """
+    log = logger.bind(user_id=user_id, bucket=bucket, key=key, filename=filename)
     try:
         user = User.objects.get(id=user_id)
-        logger.info(f"Starting file analysis for {filename} by user {user.username}")
+        log.info("file_analysis.started", username=user.username)
+        
+        s3_client = get_s3_client()
         
-        # Initialize S3 client
-        s3_client = client(
-            's3',
-            endpoint_url=settings.AWS_S3_ENDPOINT_URL,
-            aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-            aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-            region_name=settings.AWS_S3_REGION_NAME,
-            use_ssl=settings.AWS_S3_USE_SSL
-        )
+        # Use the stored object's metadata rather than client-reported values
+        head = s3_client.head_object(Bucket=bucket, Key=key)
+        if head['ContentLength'] != size_bytes:
+            log.warning(
+                "file_analysis.size_mismatch",
+                reported_size=size_bytes,
+                stored_size=head['ContentLength']
+            )
+            size_bytes = head['ContentLength']
+        
+        # The presigned PUT does not bound the size, so enforce the limit here
+        if size_bytes > settings.MAX_UPLOAD_SIZE:
+            log.warning(
+                "file_analysis.too_large",
+                size_bytes=size_bytes,
+                max_size=settings.MAX_UPLOAD_SIZE
+            )
+            return {'error': 'File exceeds the maximum upload size', 'size_bytes': size_bytes}
         
-        # Download file from S3 and compute SHA-256
-        file_buffer = BytesIO()
-        s3_client.download_fileobj(bucket, key, file_buffer)
-        file_buffer.seek(0)
+        # MIME types are case-insensitive and may carry parameters
+        content_type = (head.get('ContentType') or '').split(';', 1)[0].strip().lower()
+        needs_sniffing = content_type in GENERIC_CONTENT_TYPES
         
-        # Compute SHA-256 hash
-        sha256_hash = hashlib.sha256()
-        file_content = file_buffer.read()
-        sha256_hash.update(file_content)
-        file_sha256 = sha256_hash.hexdigest()
+        # Stream file from S3, computing SHA-256 without holding it in memory
+        sink = _HashingSink(sniff_bytes=MIME_SNIFF_BYTES if needs_sniffing else 0)
+        with create_transfer_manager(s3_client, S3_TRANSFER_CONFIG) as transfer:
+            subscriber = _KnownObjectSubscriber(size_bytes, head['ETag'])
+            transfer.download(bucket, key, sink, subscribers=[subscriber]).result()
+        file_sha256 = sink.sha256.hexdigest()
         
-        # Detect MIME type
-        mime_type = magic.from_buffer(file_content, mime=True)
+        # Fall back to detecting the MIME type from the leading bytes
+        if needs_sniffing:
+            mime_type = magic.from_buffer(bytes(sink.head), mime=True)
+        else:
+            mime_type = content_type
         
         # Check for duplicates
         duplicate_file = FileAsset.objects.filter(sha256=file_sha256).exclude(user=user).first()
         
         # Calculate environmental impact
-        size_gb = size_bytes / (1024 * 1024 * 1024)
-        kwh_estimate = size_gb * settings.REGION_KWH_PER_GB
-        co2_g_estimate = kwh_estimate * settings.REGION_CO2_G_PER_KWH
-        
-        # Calculate impact score (0-100)
-        impact_score = min(100, int((size_gb * 100) + (co2_g_estimate / 1000 * 10)))
+        kwh_estimate, co2_g_estimate, impact_score = calculate_impact(size_bytes)
         
         # Create storage URL
         storage_url = f"{settings.AWS_S3_ENDPOINT_URL}/{bucket}/{key}"
         
-        # Create FileAsset record
-        file_asset = FileAsset.objects.create(
-            user=user,
-            filename=filename,
-            size_bytes=size_bytes,
-            mime_type=mime_type,
-            sha256=file_sha256,
-            storage_url=storage_url,
-            duplicate_of=duplicate_file,
-            kwh_estimate=kwh_estimate,
-            co2_g_estimate=co2_g_estimate,
-            impact_score=impact_score
-        )
-        
-        # Generate recommendations
-        recommendations = _generate_recommendations(file_asset)
-        
-        # Create recommendation records
-        for rec in recommendations:
-            Recommendation.objects.create(
-                file=file_asset,
-                kind=rec['kind'],
-                message=rec['message']
+        with transaction.atomic():
+            # Create FileAsset record
+            file_asset = FileAsset.objects.create(
+                user=user,
+                filename=filename,
+                size_bytes=size_bytes,
+                mime_type=mime_type,
+                sha256=file_sha256,
+                storage_url=storage_url,
+                storage_key=key,
+                duplicate_of=duplicate_file,
+                is_duplicate=duplicate_file is not None,
+                kwh_estimate=kwh_estimate,
+                co2_g_estimate=co2_g_estimate,
+                impact_score=impact_score
             )
+            
+            # Generate recommendations and store them in a single insert
+            recommendations = _generate_recommendations(file_asset)
+            Recommendation.objects.bulk_create([
+                Recommendation(file=file_asset, kind=rec['kind'], message=rec['message'])
+                for rec in recommendations
+            ])
         
-        logger.info(f"File analysis completed for {filename}. Impact score: {impact_score}")
+        log.info("file_analysis.completed", file_id=file_asset.id, impact_score=impact_score)
         
         return {
             'file_id': file_asset.id,
@@ -104,16 +165,33 @@ def analyze_file(user_id, bucket, key, filename, size_bytes):
         }
         
     except User.DoesNotExist:
-        logger.error(f"User {user_id} not found")
+        log.error("file_analysis.user_not_found")
         raise
-    except ClientError as e:
-        logger.error(f"S3 error while analyzing file: {e}")
+    except ClientError:
+        log.error("file_analysis.s3_error", exc_info=True)
         raise
-    except Exception as e:
-        logger.error(f"Unexpected error during file analysis: {e}")
+    except Exception:
+        log.error("file_analysis.unexpected_error", exc_info=True)
         raise
 
 
+def calculate_impact(size_bytes):
+    """
+    Estimate the environmental impact of storing a file.
+    
+    Returns:
+        Tuple of (kwh_estimate, co2_g_estimate, impact_score)
+    """
+    size_gb = size_bytes / (1024 * 1024 * 1024)
+    kwh_estimate = size_gb * settings.REGION_KWH_PER_GB
+    co2_g_estimate = kwh_estimate * settings.REGION_CO2_G_PER_KWH
+    
+    # Calculate impact score (0-100)
+    impact_score = min(100, int((size_gb * 100) + (co2_g_estimate / 1000 * 10)))
+    
+    return kwh_estimate, co2_g_estimate, impact_score
+
+
 def _generate_recommendations(file_asset):
     """Generate recommendations based on file characteristics"""
     recommendations = []
@@ -135,7 +213,7 @@ def _generate_recommendations(file_asset):
         })
     
     # Video/media sharing recommendation
-    if file_asset.mime_type and any(t in file_asset.mime_type for t in ['video', 'audio']):
+    if file_asset.mime_type and file_asset.mime_type.split('/', 1)[0] in STREAMABLE_MEDIA_TYPES:
         if file_asset.size_mb > 50:
             recommendations.append({
                 'kind': 'share_link',
@@ -1,3 +1,77 @@
-from django.test import TestCase
+from importlib import import_module
+from types import SimpleNamespace
 
-# Create your tests here.
+from django.test import SimpleTestCase, override_settings
+
+from .serializers import FileCommitSerializer
+
+key_from_storage_url = import_module(
+    'files.migrations.0005_fileasset_storage_key'
+).key_from_storage_url
+
+
+@override_settings(AWS_STORAGE_BUCKET_NAME='ecolink')
+class FileCommitSerializerTests(SimpleTestCase):
+    """Commit payloads may only reference the requesting user's uploads"""
+
+    def validate(self, user_id, key, bucket='ecolink'):
+        request = SimpleNamespace(user=SimpleNamespace(id=user_id))
+        serializer = FileCommitSerializer(
+            data={'bucket': bucket, 'key': key, 'filename': 'report.pdf', 'size_bytes': 1024},
+            context={'request': request}
+        )
+        serializer.is_valid()
+        return serializer.errors
+
+    def test_own_key_is_accepted(self):
+        self.assertEqual(self.validate(1, 'uploads/1/abc_report.pdf'), {})
+
+    def test_other_users_key_is_rejected(self):
+        self.assertIn('key', self.validate(1, 'uploads/2/abc_report.pdf'))
+
+    def test_user_id_prefix_must_match_exactly(self):
+        self.assertIn('key', self.validate(50, 'uploads/5/abc_report.pdf'))
+        self.assertIn('key', self.validate(5, 'uploads/50/abc_report.pdf'))
+
+    def test_bare_prefix_is_rejected(self):
+        self.assertIn('key', self.validate(1, 'uploads/1/'))
+
+    def test_other_bucket_is_rejected(self):
+        self.assertIn('bucket', self.validate(1, 'uploads/1/abc_report.pdf', bucket='other'))
+
+
+@override_settings(AWS_S3_ENDPOINT_URL='http://localhost:9000')
+class KeyFromStorageUrlTests(SimpleTestCase):
+    """Backfill of storage_key from storage_url in migration 0005"""
+
+    def test_plain_key(self):
+        self.assertEqual(
+            key_from_storage_url('http://localhost:9000/ecolink/uploads/1/abc_report.pdf'),
+            'uploads/1/abc_report.pdf'
+        )
+
+    def test_fragment_and_query_characters_are_literal(self):
+        self.assertEqual(
+            key_from_storage_url('http://localhost:9000/ecolink/uploads/1/abc_report#2.pdf'),
+            'uploads/1/abc_report#2.pdf'
+        )
+        self.assertEqual(
+            key_from_storage_url('http://localhost:9000/ecolink/uploads/1/abc_what?.pdf'),
+            'uploads/1/abc_what?.pdf'
+        )
+
+    def test_endpoint_with_trailing_slash(self):
+        self.assertEqual(
+            key_from_storage_url('http://localhost:9000//ecolink/uploads/1/abc_report.pdf'),
+            'uploads/1/abc_report.pdf'
+        )
+
+    def test_other_endpoint(self):
+        self.assertEqual(
+            key_from_storage_url('https://s3.example.com//ecolink/uploads/1/abc_report.pdf'),
+            'uploads/1/abc_report.pdf'
+        )
+
+    def test_unrecognised_url_is_skipped(self):
+        self.assertIsNone(key_from_storage_url('http://localhost:9000/ecolink/'))
+        self.assertIsNone(key_from_storage_url('not a url'))
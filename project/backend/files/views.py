@@ -1,23 +1,34 @@
+import base64
 import uuid
 from datetime import datetime, timedelta
 from rest_framework import viewsets, status, permissions
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from django.conf import settings
-from boto3 import client
+from django.db.models import Count, F
+from django.utils.cache import patch_vary_headers
 from botocore.exceptions import ClientError
 import structlog
 
+from ecolink.log import bind_request
 from .models import FileAsset, Recommendation
 from .serializers import (
     FileAssetSerializer, FileAssetListSerializer, 
     RecommendationSerializer, FileCommitSerializer
 )
+from .storage import (
+    S3_BUCKET, PRESIGNED_URL_REFRESH_MARGIN,
+    get_s3_client, get_presigned_download_url, get_public_url
+)
 from .tasks import analyze_file
 
 logger = structlog.get_logger(__name__)
 
 
+def _short_uuid():
+    """Random 128-bit id as 22 URL-safe base64 characters (vs 32 hex)"""
+    return base64.urlsafe_b64encode(uuid.uuid4().bytes).rstrip(b'=').decode()
+
+
 class FileAssetViewSet(viewsets.ReadOnlyModelViewSet):
     """ViewSet for FileAsset operations"""
     
@@ -30,11 +41,27 @@ class FileAssetViewSet(viewsets.ReadOnlyModelViewSet):
     
     def get_queryset(self):
         """Return files for the current user"""
-        return FileAsset.objects.filter(user=self.request.user).order_by('-created_at')
+        queryset = FileAsset.objects.filter(user=self.request.user)
+        
+        if self.action == 'list':
+            # Plain rows with just the columns FileAssetListSerializer reads
+            queryset = queryset.values(
+                'id', 'filename', 'size_bytes', 'mime_type', 'is_duplicate',
+                'impact_score', 'created_at', username=F('user__username')
+            ).annotate(recommendations_count=Count('recommendations'))
+        elif self.action == 'retrieve':
+            queryset = queryset.select_related(
+                'user', 'duplicate_of', 'duplicate_of__user'
+            ).prefetch_related('recommendations')
+        else:
+            queryset = queryset.select_related('user')
+        
+        return queryset.order_by('-created_at')
     
     @action(detail=False, methods=['post'], url_path='request-upload-url')
     def request_upload_url(self, request):
         """Generate a presigned URL for file upload to S3"""
+        log = bind_request(logger, request)
         try:
             filename = request.data.get('filename')
             content_type = request.data.get('content_type', 'application/octet-stream')
@@ -46,23 +73,15 @@ class FileAssetViewSet(viewsets.ReadOnlyModelViewSet):
                 )
             
             # Generate unique key for S3
-            file_key = f"uploads/{request.user.id}/{uuid.uuid4().hex}_{filename}"
-            
-            # Initialize S3 client
-            s3_client = client(
-                's3',
-                endpoint_url=settings.AWS_S3_ENDPOINT_URL,
-                aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-                aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-                region_name=settings.AWS_S3_REGION_NAME,
-                use_ssl=settings.AWS_S3_USE_SSL
-            )
+            file_key = f"uploads/{request.user.id}/{_short_uuid()}_{filename}"
+            
+            s3_client = get_s3_client()
             
             # Generate presigned URL for PUT operation
             presigned_url = s3_client.generate_presigned_url(
                 'put_object',
                 Params={
-                    'Bucket': settings.AWS_STORAGE_BUCKET_NAME,
+                    'Bucket': S3_BUCKET,
                     'Key': file_key,
                     'ContentType': content_type,
                 },
@@ -70,23 +89,23 @@ class FileAssetViewSet(viewsets.ReadOnlyModelViewSet):
                 HttpMethod='PUT'
             )
             
-            logger.info(f"Generated presigned URL for {filename} by user {request.user.username}")
+            log.info("presigned_url.generated", filename=filename, key=file_key)
             
             return Response({
                 'upload_url': presigned_url,
-                'bucket': settings.AWS_STORAGE_BUCKET_NAME,
+                'bucket': S3_BUCKET,
                 'key': file_key,
                 'expires_in': 3600
             })
             
-        except ClientError as e:
-            logger.error(f"S3 error generating presigned URL: {e}")
+        except ClientError:
+            log.error("presigned_url.s3_error", exc_info=True)
             return Response(
                 {'error': 'Failed to generate upload URL'}, 
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
-        except Exception as e:
-            logger.error(f"Unexpected error generating presigned URL: {e}")
+        except Exception:
+            log.error("presigned_url.unexpected_error", exc_info=True)
             return Response(
                 {'error': 'Internal server error'}, 
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -95,7 +114,8 @@ class FileAssetViewSet(viewsets.ReadOnlyModelViewSet):
     @action(detail=False, methods=['post'], url_path='commit')
     def commit_upload(self, request):
         """Commit a file upload and trigger analysis"""
-        serializer = FileCommitSerializer(data=request.data)
+        log = bind_request(logger, request)
+        serializer = FileCommitSerializer(data=request.data, context={'request': request})
         if not serializer.is_valid():
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
         
@@ -111,7 +131,7 @@ class FileAssetViewSet(viewsets.ReadOnlyModelViewSet):
                 size_bytes=data['size_bytes']
             )
             
-            logger.info(f"Queued analysis task {task_result.id} for {data['filename']}")
+            log.info("upload.analysis_queued", task_id=task_result.id, filename=data['filename'])
             
             return Response({
                 'message': 'File upload committed successfully',
@@ -120,8 +140,8 @@ class FileAssetViewSet(viewsets.ReadOnlyModelViewSet):
                 'size_bytes': data['size_bytes']
             }, status=status.HTTP_202_ACCEPTED)
             
-        except Exception as e:
-            logger.error(f"Error committing file upload: {e}")
+        except Exception:
+            log.error("upload.commit_failed", exc_info=True, filename=data['filename'])
             return Response(
                 {'error': 'Failed to process file upload'}, 
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -130,55 +150,52 @@ class FileAssetViewSet(viewsets.ReadOnlyModelViewSet):
     @action(detail=True, methods=['get'], url_path='download-url')
     def get_download_url(self, request, pk=None):
         """Generate a presigned URL for file download"""
+        log = bind_request(logger, request).bind(file_id=pk)
         try:
             file_asset = self.get_object()
             
-            # Extract key from storage_url
-            storage_url = file_asset.storage_url
-            if not storage_url:
+            key = file_asset.storage_key
+            if not key:
                 return Response(
-                    {'error': 'File storage URL not available'}, 
+                    {'error': 'File storage key not available'}, 
                     status=status.HTTP_404_NOT_FOUND
                 )
             
-            # Parse the key from the storage URL
-            key = storage_url.split('/')[-1]  # Simple extraction, could be improved
-            
-            # Initialize S3 client
-            s3_client = client(
-                's3',
-                endpoint_url=settings.AWS_S3_ENDPOINT_URL,
-                aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-                aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-                region_name=settings.AWS_S3_REGION_NAME,
-                use_ssl=settings.AWS_S3_USE_SSL
+            # Public buckets behind a CDN need no signature
+            public_url = get_public_url(key)
+            if public_url:
+                return Response({
+                    'download_url': public_url,
+                    'expires_in': None,
+                    'filename': file_asset.filename
+                })
+            
+            # Generate (or reuse) presigned URL for GET operation
+            presigned_url, expires_in = get_presigned_download_url(
+                file_asset, S3_BUCKET, key
             )
             
-            # Generate presigned URL for GET operation
-            presigned_url = s3_client.generate_presigned_url(
-                'get_object',
-                Params={
-                    'Bucket': settings.AWS_STORAGE_BUCKET_NAME,
-                    'Key': key,
-                },
-                ExpiresIn=3600,  # 1 hour
-                HttpMethod='GET'
-            )
+            # Let the browser reuse this response until shortly before the URL expires;
+            # private because the URL is scoped to the requesting user
+            max_age = max(expires_in - PRESIGNED_URL_REFRESH_MARGIN, 0)
             
-            return Response({
+            response = Response({
                 'download_url': presigned_url,
-                'expires_in': 3600,
+                'expires_in': expires_in,
                 'filename': file_asset.filename
-            })
+            }, headers={'Cache-Control': f'private, max-age={max_age}'})
+            # Auth is a bearer header, which browser caches do not key on by default
+            patch_vary_headers(response, ('Authorization',))
+            return response
             
-        except ClientError as e:
-            logger.error(f"S3 error generating download URL: {e}")
+        except ClientError:
+            log.error("download_url.s3_error", exc_info=True)
             return Response(
                 {'error': 'Failed to generate download URL'}, 
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
-        except Exception as e:
-            logger.error(f"Unexpected error generating download URL: {e}")
+        except Exception:
+            log.error("download_url.unexpected_error", exc_info=True)
             return Response(
                 {'error': 'Internal server error'}, 
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -193,6 +210,7 @@ class RecommendationViewSet(viewsets.ReadOnlyModelViewSet):
     
     def get_queryset(self):
         """Return recommendations for the current user's files"""
+        # RecommendationSerializer reads no file columns, so only filter through the join
         return Recommendation.objects.filter(
             file__user=self.request.user
-        ).select_related('file').order_by('-created_at')
+        ).only('id', 'kind', 'message', 'created_at').order_by('-created_at')
@@ -1,18 +1,35 @@
 # Simple Mock Backend API for EcoLink
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Response
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, ConfigDict
+import hashlib
+import hmac
 import json
+import orjson
 from typing import List, Optional
+import time
 import uuid
 from datetime import datetime
 
-app = FastAPI(title="EcoLink Mock API", description="Mock backend for EcoLink demo")
+app = FastAPI(
+    title="EcoLink Mock API",
+    description="Mock backend for EcoLink demo",
+    default_response_class=ORJSONResponse,
+)
+
+# Mock CO2 estimate in grams per stored byte
+CO2_PER_BYTE = 4e-7
 
-# CORS middleware
+# CORS middleware; Starlette tests `origin in allow_origins`, so a set makes it a hash lookup
+ALLOWED_ORIGINS = frozenset({
+    "https://ecolink-demo.surge.sh",
+    "http://localhost:5173",
+    "http://localhost:3000",
+})
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["https://ecolink-demo.surge.sh", "http://localhost:5173", "http://localhost:3000"],
+    allow_origins=ALLOWED_ORIGINS,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
@@ -40,10 +57,22 @@ class FileUpload(BaseModel):
     size: int
     content_type: str
 
+class FileCommitRequest(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+
+    filename: str = "unknown"
+    size: int = 0
+
+def _hash_password(password: str) -> bytes:
+    return hashlib.sha256(password.encode()).digest()
+
+# Compared against for unknown usernames so every login does the same work
+_DUMMY_PW_HASH = _hash_password("")
+
 # Mock database
 mock_users = {
-    "demo": {"username": "demo", "password": "demo123", "email": "demo@ecolink.com"},
-    "admin": {"username": "admin", "password": "admin123", "email": "admin@ecolink.com"}
+    "demo": {"username": "demo", "pw_hash": _hash_password("demo123"), "email": "demo@ecolink.com"},
+    "admin": {"username": "admin", "pw_hash": _hash_password("admin123"), "email": "admin@ecolink.com"}
 }
 
 mock_files = []
@@ -55,21 +84,117 @@ mock_analytics = {
     "duplicates_found": 8
 }
 
+# Second-resolution timestamp shared by requests within the same second
+_now_iso = datetime.now().isoformat()
+_now_iso_refreshed_at = time.monotonic()
+
+def _cached_now_iso() -> str:
+    global _now_iso, _now_iso_refreshed_at
+    now = time.monotonic()
+    if now - _now_iso_refreshed_at >= 1:
+        _now_iso = datetime.now().isoformat()
+        _now_iso_refreshed_at = now
+    return _now_iso
+
+# Static payloads, encoded once at import time
+_ROOT_JSON = orjson.dumps({"message": "EcoLink Mock API is running!", "version": "1.0.0"})
+
+_FILES_JSON = orjson.dumps({
+    "results": [
+        {
+            "id": 1,
+            "filename": "document.pdf",
+            "size": 1048576,
+            "upload_date": "2024-09-20T10:30:00Z",
+            "co2_impact": 0.45,
+            "is_duplicate": False
+        },
+        {
+            "id": 2,
+            "filename": "image.jpg",
+            "size": 2097152,
+            "upload_date": "2024-09-20T11:15:00Z",
+            "co2_impact": 0.89,
+            "is_duplicate": False
+        },
+        {
+            "id": 3,
+            "filename": "spreadsheet.xlsx",
+            "size": 524288,
+            "upload_date": "2024-09-20T14:22:00Z",
+            "co2_impact": 0.22,
+            "is_duplicate": True
+        }
+    ],
+    "count": 3
+})
+
+_FILE_TYPES_JSON = orjson.dumps({
+    "data": [
+        {"type": "PDF", "count": 15, "size_gb": 4.2},
+        {"type": "Images", "count": 20, "size_gb": 6.8},
+        {"type": "Documents", "count": 8, "size_gb": 1.1},
+        {"type": "Videos", "count": 2, "size_gb": 0.2}
+    ]
+})
+
+_IMPACT_TREND_JSON = orjson.dumps({
+    "data": [
+        {"date": "2024-09-15", "co2_saved": 45.2, "files": 8},
+        {"date": "2024-09-16", "co2_saved": 67.8, "files": 12},
+        {"date": "2024-09-17", "co2_saved": 89.1, "files": 15},
+        {"date": "2024-09-18", "co2_saved": 123.4, "files": 22},
+        {"date": "2024-09-19", "co2_saved": 178.9, "files": 35},
+        {"date": "2024-09-20", "co2_saved": 234.5, "files": 45}
+    ]
+})
+
+_RECOMMENDATIONS_JSON = orjson.dumps({
+    "results": [
+        {
+            "type": "duplicate",
+            "title": "Remove duplicate files",
+            "description": "You have 8 duplicate files taking up 2.3 GB of storage",
+            "potential_savings": "1.2 kg CO2",
+            "priority": "high"
+        },
+        {
+            "type": "compression",
+            "title": "Compress large images",
+            "description": "12 images can be compressed to save space",
+            "potential_savings": "0.8 kg CO2",
+            "priority": "medium"
+        },
+        {
+            "type": "archive",
+            "title": "Archive old files",
+            "description": "Files older than 6 months can be archived",
+            "potential_savings": "0.5 kg CO2",
+            "priority": "low"
+        }
+    ]
+})
+
 @app.get("/")
 async def root():
-    return {"message": "EcoLink Mock API is running!", "version": "1.0.0"}
+    return Response(content=_ROOT_JSON, media_type="application/json")
 
 @app.get("/health")
 async def health_check():
-    return {"status": "healthy", "timestamp": datetime.now().isoformat()}
+    return {"status": "healthy", "timestamp": _cached_now_iso()}
 
 @app.post("/api/auth/login/", response_model=LoginResponse)
 async def login(request: LoginRequest):
-    if request.username in mock_users and mock_users[request.username]["password"] == request.password:
+    entry = mock_users.get(request.username)
+    password_ok = hmac.compare_digest(
+        _hash_password(request.password),
+        entry["pw_hash"] if entry else _DUMMY_PW_HASH
+    )
+    if entry and password_ok:
         return LoginResponse(
             access=f"mock-access-token-{request.username}",
             refresh=f"mock-refresh-token-{request.username}",
-            user={"username": request.username, "email": mock_users[request.username]["email"]}
+            user={"username": request.username, "email": entry["email"]}
         )
     raise HTTPException(status_code=401, detail="Invalid credentials")
 
@@ -80,7 +205,7 @@ async def register(request: RegisterRequest):
     
     mock_users[request.username] = {
         "username": request.username,
-        "password": request.password,
+        "pw_hash": _hash_password(request.password),
         "email": request.email,
         "firstName": request.firstName,
         "lastName": request.lastName
@@ -92,40 +217,12 @@ async def register(request: RegisterRequest):
 async def get_analytics():
     return {
         "data": mock_analytics,
-        "timestamp": datetime.now().isoformat()
+        "timestamp": _cached_now_iso()
     }
 
 @app.get("/api/v1/files/")
 async def get_files():
-    return {
-        "results": [
-            {
-                "id": 1,
-                "filename": "document.pdf",
-                "size": 1048576,
-                "upload_date": "2024-09-20T10:30:00Z",
-                "co2_impact": 0.45,
-                "is_duplicate": False
-            },
-            {
-                "id": 2,
-                "filename": "image.jpg",
-                "size": 2097152,
-                "upload_date": "2024-09-20T11:15:00Z",
-                "co2_impact": 0.89,
-                "is_duplicate": False
-            },
-            {
-                "id": 3,
-                "filename": "spreadsheet.xlsx",
-                "size": 524288,
-                "upload_date": "2024-09-20T14:22:00Z",
-                "co2_impact": 0.22,
-                "is_duplicate": True
-            }
-        ],
-        "count": 3
-    }
+    return Response(content=_FILES_JSON, media_type="application/json")
 
 @app.post("/api/v1/files/request-upload-url/")
 async def request_upload_url(file: FileUpload):
@@ -136,13 +233,13 @@ async def request_upload_url(file: FileUpload):
     }
 
 @app.post("/api/v1/files/commit/")
-async def commit_file_upload(file_data: dict):
+async def commit_file_upload(file_data: FileCommitRequest):
     new_file = {
         "id": len(mock_files) + 1,
-        "filename": file_data.get("filename", "unknown"),
-        "size": file_data.get("size", 0),
+        "filename": file_data.filename,
+        "size": file_data.size,
         "upload_date": datetime.now().isoformat(),
-        "co2_impact": round(file_data.get("size", 0) * 0.0000004, 2),
+        "co2_impact": round(file_data.size * CO2_PER_BYTE, 2),
         "is_duplicate": False
     }
     mock_files.append(new_file)
@@ -150,55 +247,15 @@ async def commit_file_upload(file_data: dict):
 
 @app.get("/api/v1/analytics/file-types/")
 async def get_file_types():
-    return {
-        "data": [
-            {"type": "PDF", "count": 15, "size_gb": 4.2},
-            {"type": "Images", "count": 20, "size_gb": 6.8},
-            {"type": "Documents", "count": 8, "size_gb": 1.1},
-            {"type": "Videos", "count": 2, "size_gb": 0.2}
-        ]
-    }
+    return Response(content=_FILE_TYPES_JSON, media_type="application/json")
 
 @app.get("/api/v1/analytics/impact-trend/")
 async def get_impact_trend():
-    return {
-        "data": [
-            {"date": "2024-09-15", "co2_saved": 45.2, "files": 8},
-            {"date": "2024-09-16", "co2_saved": 67.8, "files": 12},
-            {"date": "2024-09-17", "co2_saved": 89.1, "files": 15},
-            {"date": "2024-09-18", "co2_saved": 123.4, "files": 22},
-            {"date": "2024-09-19", "co2_saved": 178.9, "files": 35},
-            {"date": "2024-09-20", "co2_saved": 234.5, "files": 45}
-        ]
-    }
+    return Response(content=_IMPACT_TREND_JSON, media_type="application/json")
 
 @app.get("/api/v1/recommendations/")
 async def get_recommendations():
-    return {
-        "results": [
-            {
-                "type": "duplicate",
-                "title": "Remove duplicate files",
-                "description": "You have 8 duplicate files taking up 2.3 GB of storage",
-                "potential_savings": "1.2 kg CO2",
-                "priority": "high"
-            },
-            {
-                "type": "compression",
-                "title": "Compress large images",
-                "description": "12 images can be compressed to save space",
-                "potential_savings": "0.8 kg CO2",
-                "priority": "medium"
-            },
-            {
-                "type": "archive",
-                "title": "Archive old files",
-                "description": "Files older than 6 months can be archived",
-                "potential_savings": "0.5 kg CO2",
-                "priority": "low"
-            }
-        ]
-    }
+    return Response(content=_RECOMMENDATIONS_JSON, media_type="application/json")
 
 if __name__ == "__main__":
     import uvicorn
@@ -7,6 +7,7 @@ Run with: python manage.py shell < seed_data.py
 import os
 import django
 from django.contrib.auth.models import User
+from django.db import transaction
 from files.models import FileAsset, Recommendation
 
 # Demo user credentials
@@ -45,6 +46,7 @@ def create_sample_files(user):
             'mime_type': 'application/pdf',
             'sha256': 'a1b2c3d4e5f6789012345678901234567890abcdef',
             'storage_url': 'http://localhost:9000/ecolink/uploads/1/presentation.pdf',
+            'storage_key': 'uploads/1/presentation.pdf',
             'kwh_estimate': 0.030,
             'co2_g_estimate': 12.0,
             'impact_score': 25,
@@ -55,6 +57,7 @@ def create_sample_files(user):
             'mime_type': 'image/jpeg',
             'sha256': 'b2c3d4e5f6789012345678901234567890abcdef12',
             'storage_url': 'http://localhost:9000/ecolink/uploads/1/image.jpg',
+            'storage_key': 'uploads/1/image.jpg',
             'kwh_estimate': 0.012,
             'co2_g_estimate': 4.8,
             'impact_score': 15,
@@ -65,6 +68,7 @@ def create_sample_files(user):
             'mime_type': 'video/mp4',
             'sha256': 'c3d4e5f6789012345678901234567890abcdef123',
             'storage_url': 'http://localhost:9000/ecolink/uploads/1/video.mp4',
+            'storage_key': 'uploads/1/video.mp4',
             'kwh_estimate': 0.300,
             'co2_g_estimate': 120.0,
             'impact_score': 75,
@@ -75,26 +79,31 @@ def create_sample_files(user):
             'mime_type': 'application/pdf',
             'sha256': 'a1b2c3d4e5f6789012345678901234567890abcdef',  # Same hash as first
             'storage_url': 'http://localhost:9000/ecolink/uploads/1/presentation_copy.pdf',
+            'storage_key': 'uploads/1/presentation_copy.pdf',
             'kwh_estimate': 0.030,
             'co2_g_estimate': 12.0,
             'impact_score': 25,
         },
     ]
     
-    created_files = []
+    created_files = FileAsset.objects.bulk_create(
+        [FileAsset(user=user, **file_data) for file_data in sample_files]
+    )
+    
+    if created_files[0].pk is None:
+        # MySQL cannot return primary keys from a bulk insert; reload the new rows
+        created_files = list(
+            FileAsset.objects.filter(user=user).order_by('-id')[:len(sample_files)]
+        )[::-1]
     
-    for file_data in sample_files:
-        file_asset = FileAsset.objects.create(
-            user=user,
-            **file_data
-        )
-        created_files.append(file_asset)
-        print(f"✅ Created sample file: {file_data['filename']}")
+    for file_asset in created_files:
+        print(f"✅ Created sample file: {file_asset.filename}")
     
     # Set up duplicate relationship
     if len(created_files) >= 4:
         created_files[3].duplicate_of = created_files[0]  # presentation_copy is duplicate of presentation
-        created_files[3].save()
+        created_files[3].is_duplicate = True
+        created_files[3].save(update_fields=['duplicate_of', 'is_duplicate'])
         print(f"✅ Set duplicate relationship: {created_files[3].filename} -> {created_files[0].filename}")
     
     return created_files
@@ -120,22 +129,26 @@ def create_sample_recommendations(files):
         },
     ]
     
+    Recommendation.objects.bulk_create(
+        [Recommendation(**rec_data) for rec_data in recommendations_data]
+    )
+    
     for rec_data in recommendations_data:
-        recommendation = Recommendation.objects.create(**rec_data)
         print(f"✅ Created recommendation for {rec_data['file'].filename}: {rec_data['kind']}")
 
 def main():
     """Main function to seed the database"""
     print("🌱 Seeding EcoLink database with demo data...")
     
-    # Create demo user
-    demo_user = create_demo_user()
-    
-    # Create sample files
-    sample_files = create_sample_files(demo_user)
-    
-    # Create sample recommendations
-    create_sample_recommendations(sample_files)
+    with transaction.atomic():
+        # Create demo user
+        demo_user = create_demo_user()
+        
+        # Create sample files
+        sample_files = create_sample_files(demo_user)
+        
+        # Create sample recommendations
+        create_sample_recommendations(sample_files)
     
     print(f"\n✅ Database seeding complete!")
     print(f"📝 Demo login credentials:")
@@ -90,7 +90,7 @@ export interface UploadUrlResponse {
 
 export interface DownloadUrlResponse {
   download_url: string
-  expires_in: number
+  expires_in: number | null  // null for public CDN URLs, which do not expire
   filename: string
 }
 